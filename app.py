@@ -5,16 +5,16 @@ Análise de emoções em texto (português) e imagens faciais
 utilizando modelos de IA da Hugging Face.
 """
 from pathlib import Path
+import sys
 
 import streamlit as st
 
-from config.settings import UI, MESSAGES
+from config.settings import UI, MESSAGES, LATENCY, PROFILING
 from services.model_loader import load_all_models
-from services.text_processor import analyze_text_emotion
-from services.image_processor import analyze_facial_emotion
-from services.llm_combiner import analyze_with_local_llm
-from components.inputs import collect_inputs
-from components.results import render_results_tabs
+from services.scheduler import run_scheduled_analysis
+from services.profiling import profiling_session, claim_cli_run
+from components.inputs import collect_inputs, reset_profiling_toggle
+from components.results import render_results_tabs, render_profiling_report
 
 
 def load_css() -> None:
@@ -24,6 +24,16 @@ def load_css() -> None:
         st.markdown(f"<style>{css_path.read_text()}</style>", unsafe_allow_html=True)
 
 
+def profiling_requested_from_cli() -> bool:
+    """
+    Indica se esta análise deve ser perfilada via `streamlit run app.py -- --profile`.
+    
+    Assim como a opção na interface, a flag vale para uma única análise:
+    a primeira executada após o servidor iniciar.
+    """
+    return PROFILING.CLI_FLAG in sys.argv[1:] and claim_cli_run()
+
+
 def render_footer() -> None:
     """Renderiza rodapé da aplicação."""
     st.markdown(
@@ -78,39 +88,33 @@ def main() -> None:
             st.error(MESSAGES.NO_INPUT_ERROR)
             st.stop()
         
-        text_result = None
-        image_result = None
-        llm_analysis = None
-        
-        # Processa texto
-        if inputs.has_text:
-            with st.spinner(MESSAGES.TRANSLATING):
-                text_result = analyze_text_emotion(
-                    translation_pipe,
-                    text_emotion_pipe,
-                    inputs.text
-                )
+        profile = inputs.profile or profiling_requested_from_cli()
         
-        # Processa imagem
-        if inputs.has_image:
-            with st.spinner(MESSAGES.ANALYZING_IMAGE):
-                image_result = analyze_facial_emotion(
-                    facial_emotion_pipe,
-                    inputs.image_file.getvalue(),
-                    inputs.image_file.name,
-                    inputs.use_grayscale
-                )
+        with st.spinner(MESSAGES.ANALYZING), profiling_session(profile) as report:
+            outcome = run_scheduled_analysis(
+                translation_pipe,
+                text_emotion_pipe,
+                facial_emotion_pipe,
+                inputs.text,
+                inputs.image_file.getvalue() if inputs.has_image else None,
+                inputs.image_file.name if inputs.has_image else "",
+                inputs.use_grayscale,
+                inputs.use_gemini,
+                budget_s=float("inf") if profile else LATENCY.REQUEST_BUDGET_S,
+                use_cache=not profile
+            )
         
-         # Análise combinada (apenas se tiver texto E imagem)
-        if text_result and image_result:
-            if inputs.use_gemini:
-                with st.spinner("Gerando análise integrada com Gemini..."):
-                    llm_analysis = analyze_with_local_llm(text_result, image_result)
-            else:
-                from services.llm_combiner import analyze_without_llm
-                llm_analysis = analyze_without_llm(text_result, image_result)
+        render_results_tabs(
+            outcome.text_result,
+            outcome.image_result,
+            inputs.use_grayscale,
+            outcome.llm_analysis,
+            outcome.degraded_stages
+        )
         
-        render_results_tabs(text_result, image_result, inputs.use_grayscale, llm_analysis)
+        if report:
+            render_profiling_report(report)
+            reset_profiling_toggle()
     
     render_footer()
 
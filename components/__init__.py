@@ -1,4 +1,4 @@
-from .inputs import collect_inputs, UserInputs
-from .results import render_results_tabs
+from .inputs import collect_inputs, reset_profiling_toggle, UserInputs
+from .results import render_results_tabs, render_profiling_report
 
-__all__ = ["collect_inputs", "UserInputs", "render_results_tabs"]
\ No newline at end of file
+__all__ = ["collect_inputs", "UserInputs", "reset_profiling_toggle", "render_results_tabs", "render_profiling_report"]
\ No newline at end of file
@@ -4,7 +4,7 @@ from dataclasses import dataclass
 
 import streamlit as st
 
-from config.settings import UI
+from config.settings import UI, PROFILING
 
 
 @dataclass
@@ -14,6 +14,7 @@ class UserInputs:
     image_file: Optional[object]
     use_grayscale: bool
     use_gemini: bool
+    profile: bool = False
     
     @property
     def has_text(self) -> bool:
@@ -43,18 +44,37 @@ def render_image_input() -> Optional[object]:
     )
 
 
-def render_options() -> Tuple[bool, bool]:
+def render_options() -> Tuple[bool, bool, bool]:
     """Renderiza opções de processamento."""
     grayscale = st.checkbox("Usar pré-processamento em escala de cinza", value=True)
     use_gemini = st.checkbox("Usar análise integrada com Gemini (IA)", value=False)
-    return grayscale, use_gemini
+    if st.session_state.pop(PROFILING.RESET_KEY, False):
+        st.session_state[PROFILING.TOGGLE_KEY] = False
+    with st.expander("Depuração"):
+        profile = st.checkbox(
+            "Gerar profiling da próxima análise",
+            key=PROFILING.TOGGLE_KEY,
+            help=f"Salva trace, flamegraph e resumo de operadores em '{PROFILING.OUTPUT_DIR}/'."
+        )
+    return grayscale, use_gemini, profile
+
+
+def reset_profiling_toggle() -> None:
+    """Desmarca a opção de profiling na próxima execução, limitando-a a uma análise."""
+    st.session_state[PROFILING.RESET_KEY] = True
 
 
 def collect_inputs() -> UserInputs:
     """Coleta todas as entradas do usuário."""
     text = render_text_input()
     image = render_image_input()
-    grayscale, use_gemini = render_options()
+    grayscale, use_gemini, profile = render_options()
     st.markdown("---")
     
-    return UserInputs(text=text, image_file=image, use_grayscale=grayscale, use_gemini=use_gemini)
\ No newline at end of file
+    return UserInputs(
+        text=text,
+        image_file=image,
+        use_grayscale=grayscale,
+        use_gemini=use_gemini,
+        profile=profile
+    )
\ No newline at end of file
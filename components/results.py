@@ -1,11 +1,12 @@
 """Componentes de exibição de resultados."""
-from typing import Optional
+from typing import List, Optional
 
 import streamlit as st
 
 from services.text_processor import TextResult
 from services.image_processor import ImageResult
 from services.llm_combiner import CombinedAnalysis
+from services.profiling import ProfilingReport
 from config.settings import MESSAGES
 
 
@@ -72,9 +73,16 @@ def render_results_tabs(
     text_result: Optional[TextResult],
     image_result: Optional[ImageResult],
     show_grayscale: bool,
-    llm_analysis: Optional[CombinedAnalysis] = None
+    llm_analysis: Optional[CombinedAnalysis] = None,
+    degraded_stages: Optional[List[str]] = None
 ) -> None:
     """Renderiza abas com todos os resultados."""
+    if degraded_stages:
+        st.warning(
+            MESSAGES.DEGRADED_WARNING + "\n"
+            + "\n".join(f"- {stage}" for stage in degraded_stages)
+        )
+    
     tabs = ["Texto", "Imagem"]
     if llm_analysis:
         tabs.append("Análise IA")
@@ -89,4 +97,17 @@ def render_results_tabs(
     
     if llm_analysis and len(tab_list) > 2:
         with tab_list[2]:
-            render_llm_analysis(llm_analysis)
\ No newline at end of file
+            render_llm_analysis(llm_analysis)
+
+
+def render_profiling_report(report: ProfilingReport) -> None:
+    """Renderiza os caminhos dos arquivos gerados pelo profiling."""
+    st.info(
+        f"{MESSAGES.PROFILING_SAVED} `{report.output_dir}`\n"
+        + "\n".join(f"- `{path.name}`" for path in report.files)
+    )
+    if report.warnings:
+        st.warning(
+            MESSAGES.PROFILING_CHECK_FAILED + "\n"
+            + "\n".join(f"- {warning}" for warning in report.warnings)
+        )
\ No newline at end of file
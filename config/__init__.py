@@ -1,3 +1,3 @@
-from .settings import MODELS, UI, MESSAGES
+from .settings import MODELS, UI, MESSAGES, LATENCY, PROFILING
 
-__all__ = ["MODELS", "UI", "MESSAGES"]
\ No newline at end of file
+__all__ = ["MODELS", "UI", "MESSAGES", "LATENCY", "PROFILING"]
\ No newline at end of file
@@ -31,8 +31,42 @@ class Messages:
     NO_TEXT_WARNING: str = "Nenhum texto foi inserido para análise."
     NO_IMAGE_WARNING: str = "Nenhuma imagem foi carregada para análise."
     COMBINED_WARNING: str = "Insira texto E imagem para ver o resultado combinado."
+    ANALYZING: str = "Analisando emoções dentro do orçamento de latência..."
+    DEGRADED_WARNING: str = "Parte da análise foi simplificada para respeitar o tempo limite:"
+    PROFILING_SAVED: str = "Profiling salvo em:"
+    PROFILING_CHECK_FAILED: str = "O profiling não capturou operadores de todos os modelos:"
+
+
+@dataclass(frozen=True)
+class LatencyConfig:
+    """Orçamento de latência por requisição e custos estimados de cada etapa (segundos)."""
+    REQUEST_BUDGET_S: float = 8.0
+    TRANSLATION_FULL_COST_S: float = 2.5
+    TRANSLATION_FAST_COST_S: float = 0.8
+    TEXT_CLASSIFICATION_COST_S: float = 0.3
+    MIN_TRANSLATION_TIME_S: float = 0.3
+    IMAGE_FULL_COST_S: float = 1.0
+    GEMINI_COST_S: float = 3.0
+    GEMINI_TIMEOUT_MARGIN_S: float = 0.5
+    COST_SMOOTHING: float = 0.3
+    RESULT_CACHE_SIZE: int = 32
+
+
+@dataclass(frozen=True)
+class ProfilingConfig:
+    """Configuração do modo de profiling (desligado por padrão)."""
+    CLI_FLAG: str = "--profile"
+    OUTPUT_DIR: str = "profiles"
+    SAMPLING_INTERVAL_S: float = 0.005
+    STAGE_PREFIX: str = "stage::"
+    TOP_OPERATORS: int = 15
+    MODEL_STAGES: tuple = ("tradução", "classificação de texto", "classificação facial")
+    TOGGLE_KEY: str = "profile_next_run"
+    RESET_KEY: str = "reset_profile_toggle"
 
 
 MODELS = ModelConfig()
 UI = UIConfig()
-MESSAGES = Messages()
\ No newline at end of file
+MESSAGES = Messages()
+LATENCY = LatencyConfig()
+PROFILING = ProfilingConfig()
\ No newline at end of file
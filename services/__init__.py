@@ -2,6 +2,8 @@ from .model_loader import load_all_models
 from .text_processor import analyze_text_emotion, TextResult
 from .image_processor import analyze_facial_emotion, ImageResult
 from .llm_combiner import load_llm_model, analyze_with_local_llm, CombinedAnalysis
+from .scheduler import run_scheduled_analysis, AnalysisOutcome
+from .profiling import profiling_session, claim_cli_run, ProfilingReport
 
 __all__ = [
     "load_all_models",
@@ -12,4 +14,9 @@ __all__ = [
     "load_llm_model",
     "analyze_with_local_llm",
     "CombinedAnalysis",
+    "run_scheduled_analysis",
+    "AnalysisOutcome",
+    "profiling_session",
+    "claim_cli_run",
+    "ProfilingReport",
 ]
\ No newline at end of file
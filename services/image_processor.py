@@ -6,6 +6,8 @@ from typing import Optional
 from PIL import Image
 from transformers import Pipeline
 
+from .profiling import profile_stage
+
 
 @dataclass
 class ImageResult:
@@ -45,10 +47,12 @@ def analyze_facial_emotion(
     Returns:
         ImageResult com os dados da análise.
     """
-    image = Image.open(BytesIO(image_bytes))
-    processed = preprocess_grayscale(image) if use_grayscale else image
+    with profile_stage("pré-processamento de imagem (PIL)"):
+        image = Image.open(BytesIO(image_bytes))
+        processed = preprocess_grayscale(image) if use_grayscale else image
     
-    result = pipe(processed)[0]
+    with profile_stage("classificação facial"):
+        result = pipe(processed)[0]
     
     return ImageResult(
         original_image=image,
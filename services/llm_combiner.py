@@ -18,6 +18,7 @@ if GEMINI_API_KEY:
 
 from .text_processor import TextResult
 from .image_processor import ImageResult
+from .profiling import profile_stage
 
 
 @dataclass
@@ -156,9 +157,14 @@ def _evaluate_consistency(
 
 def load_llm_model(
     text_result: Optional[TextResult],
-    image_result: Optional[ImageResult]
+    image_result: Optional[ImageResult],
+    timeout: Optional[float] = None
 ):
-    """Carrega e executa o modelo LLM para análise combinada."""
+    """
+    Carrega e executa o modelo LLM para análise combinada.
+    
+    `timeout` (segundos) limita a chamada HTTP ao Gemini.
+    """
     if not text_result or not image_result:
         return None
     
@@ -171,25 +177,28 @@ def load_llm_model(
     image_conf = image_result.confidence
     text_content = text_result.original
 
-    llm_response = client.models.generate_content(
-        model="gemini-2.5-flash",
-        config=types.GenerateContentConfig(
-            thinking_config=types.ThinkingConfig(thinking_budget=0),
-            system_instruction="Você deverá analisar as emoções faciais de um indivíduo e a emoção da fala do mesmo, e então você deverá explicar a possivel explicação para a combinação dessas emoções. Seja claro e conciso em sua resposta, explique tudo em um só parágrafo.",
-        ),
-        contents=f'A emoção facial é "{image_em}" com confiança de "{image_conf}%". A emoção do texto é "{text_em}" com confiança de "{text_conf}%". O conteúdo do texto é: "{text_content}"'
-    )
+    with profile_stage("gemini"):
+        llm_response = client.models.generate_content(
+            model="gemini-2.5-flash",
+            config=types.GenerateContentConfig(
+                thinking_config=types.ThinkingConfig(thinking_budget=0),
+                http_options=types.HttpOptions(timeout=int(timeout * 1000)) if timeout else None,
+                system_instruction="Você deverá analisar as emoções faciais de um indivíduo e a emoção da fala do mesmo, e então você deverá explicar a possivel explicação para a combinação dessas emoções. Seja claro e conciso em sua resposta, explique tudo em um só parágrafo.",
+            ),
+            contents=f'A emoção facial é "{image_em}" com confiança de "{image_conf}%". A emoção do texto é "{text_em}" com confiança de "{text_conf}%". O conteúdo do texto é: "{text_content}"'
+        )
     return llm_response
 
 
 def analyze_with_local_llm(
     text_result: Optional[TextResult],
-    image_result: Optional[ImageResult]
+    image_result: Optional[ImageResult],
+    timeout: Optional[float] = None
 ) -> CombinedAnalysis:
     """Analisa resultados usando lógica inteligente + Gemini."""
     interpretation = generate_interpretation(text_result, image_result)
 
-    llm_response = load_llm_model(text_result, image_result)
+    llm_response = load_llm_model(text_result, image_result, timeout)
 
     llm_summary = "N/A"
     if llm_response and hasattr(llm_response, 'content'):
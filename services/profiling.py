@@ -0,0 +1,248 @@
+"""Modo de profiling opcional para uma única execução da análise."""
+from collections import Counter, defaultdict
+from contextlib import contextmanager, nullcontext
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+import sys
+import threading
+import uuid
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from config.settings import PROFILING
+
+# Etapas marcadas na análise em profiling, ou None quando desligado. Por ser
+# uma ContextVar, só a sessão (thread do script) que ativou o profiling é
+# afetada; as demais sessões continuam pagando apenas um `get()`.
+_entered_stages: ContextVar[Optional[List[str]]] = ContextVar("entered_stages", default=None)
+_NULL_CONTEXT = nullcontext()
+
+# Uma análise perfilada por vez no processo: o torch profiler não suporta
+# sessões concorrentes.
+_session_lock = threading.Lock()
+
+# A flag de linha de comando perfila apenas a primeira análise do servidor.
+_cli_run_lock = threading.Lock()
+_cli_run_claimed = False
+
+
+@dataclass
+class ProfilingReport:
+    """Arquivos gerados por uma sessão de profiling."""
+    output_dir: Path
+    files: List[Path] = field(default_factory=list)
+    warnings: List[str] = field(default_factory=list)
+
+
+class PythonSampler:
+    """
+    Profiler por amostragem no estilo py-spy, executado em uma thread própria.
+
+    Coleta periodicamente a pilha das threads indicadas e acumula as amostras
+    no formato "collapsed stack" usado para gerar flamegraphs.
+    """
+
+    def __init__(
+        self,
+        thread_ids: Tuple[int, ...],
+        interval_s: float = PROFILING.SAMPLING_INTERVAL_S
+    ):
+        self.thread_ids = thread_ids
+        self.interval_s = interval_s
+        self.samples: Counter = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="python-sampler", daemon=True)
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval_s):
+            names = {t.ident: t.name for t in threading.enumerate()}
+            frames = sys._current_frames()
+            for thread_id in self.thread_ids:
+                frame = frames.get(thread_id)
+                if frame is None:
+                    continue
+                stack = []
+                while frame is not None:
+                    code = frame.f_code
+                    stack.append(f"{code.co_name} ({Path(code.co_filename).name}:{frame.f_lineno})")
+                    frame = frame.f_back
+                stack.append(names.get(thread_id, str(thread_id)))
+                self.samples[";".join(reversed(stack))] += 1
+
+    def write_collapsed(self, path: Path) -> None:
+        """Salva as amostras em formato collapsed (flamegraph.pl, speedscope)."""
+        lines = [f"{stack} {count}" for stack, count in self.samples.most_common()]
+        path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+
+
+def claim_cli_run() -> bool:
+    """Retorna True apenas na primeira chamada do processo (perfil via CLI)."""
+    global _cli_run_claimed
+    with _cli_run_lock:
+        if _cli_run_claimed:
+            return False
+        _cli_run_claimed = True
+        return True
+
+
+def is_profiling() -> bool:
+    """Indica se o contexto atual está dentro de uma sessão de profiling."""
+    return _entered_stages.get() is not None
+
+
+def profile_stage(name: str):
+    """
+    Marca uma etapa (modelo) no trace do torch profiler.
+
+    Retorna um contexto nulo compartilhado quando o profiling está desligado.
+    """
+    entered = _entered_stages.get()
+    if entered is None:
+        return _NULL_CONTEXT
+    from torch.profiler import record_function
+    entered.append(name)
+    return record_function(f"{PROFILING.STAGE_PREFIX}{name}")
+
+
+def _aggregate_operators(events) -> Tuple[Dict[str, float], Dict[str, Dict[str, List[float]]]]:
+    """
+    Agrega os operadores por etapa.
+
+    Cada operador é atribuído à etapa cujo intervalo (na mesma thread) o contém.
+
+    Returns:
+        Tempo total por etapa (us) e, por etapa, [chamadas, self CPU (us)] por operador.
+    """
+    stages = [e for e in events if e.name.startswith(PROFILING.STAGE_PREFIX)]
+    per_stage: Dict[str, Dict[str, List[float]]] = defaultdict(
+        lambda: defaultdict(lambda: [0, 0.0])
+    )
+    stage_wall: Dict[str, float] = defaultdict(float)
+    for stage in stages:
+        stage_wall[stage.name[len(PROFILING.STAGE_PREFIX):]] += stage.time_range.elapsed_us()
+
+    for event in events:
+        if event.name.startswith(PROFILING.STAGE_PREFIX):
+            continue
+        for stage in stages:
+            if (
+                event.thread == stage.thread
+                and stage.time_range.start <= event.time_range.start
+                and event.time_range.end <= stage.time_range.end
+            ):
+                totals = per_stage[stage.name[len(PROFILING.STAGE_PREFIX):]][event.name]
+                totals[0] += 1
+                totals[1] += event.self_cpu_time_total
+                break
+    return stage_wall, per_stage
+
+
+def _check_operators(
+    entered: List[str],
+    per_stage: Dict[str, Dict[str, List[float]]]
+) -> List[str]:
+    """Verifica se cada etapa de modelo executada registrou operadores aten."""
+    warnings = []
+    for name in dict.fromkeys(entered):
+        if name not in PROFILING.MODEL_STAGES:
+            continue
+        if not any(op.startswith("aten::") for op in per_stage.get(name, {})):
+            warnings.append(f"Nenhum operador aten registrado na etapa '{name}'.")
+    return warnings
+
+
+def _format_operators(
+    stage_wall: Dict[str, float],
+    per_stage: Dict[str, Dict[str, List[float]]],
+    warnings: List[str]
+) -> str:
+    """Monta o resumo de operadores por modelo."""
+    lines = [f"AVISO: {warning}" for warning in warnings]
+    if lines:
+        lines.append("")
+    for stage_name, wall_us in stage_wall.items():
+        lines.append(f"== {stage_name} (tempo total: {wall_us / 1000:.1f} ms)")
+        lines.append(f"{'operador':<48}{'chamadas':>10}{'self CPU (ms)':>16}")
+        ranked = sorted(per_stage[stage_name].items(), key=lambda item: item[1][1], reverse=True)
+        for op_name, (calls, self_us) in ranked[:PROFILING.TOP_OPERATORS]:
+            lines.append(f"{op_name[:47]:<48}{calls:>10}{self_us / 1000:>16.2f}")
+        lines.append("")
+    return "\n".join(lines)
+
+
+@contextmanager
+def profiling_session(enabled: bool) -> Iterator[Optional[ProfilingReport]]:
+    """
+    Envolve uma análise com o torch profiler e o profiler por amostragem.
+
+    Ao sair, salva em `PROFILING.OUTPUT_DIR/<timestamp>-<id>/`:
+        - trace.json: trace no formato Chrome (chrome://tracing, Perfetto);
+        - python_stacks.collapsed: pilhas Python para flamegraph;
+        - operators.txt: resumo de operadores por modelo.
+
+    O torch profiler só registra a thread que o iniciou, por isso o agendador
+    executa as etapas na própria thread enquanto `is_profiling()` for
+    verdadeiro. O sampler também amostra apenas essa thread, de modo que
+    outras sessões do servidor não aparecem no flamegraph. Sessões de
+    profiling simultâneas aguardam umas às outras.
+
+    Quando `enabled` é falso, nada é importado nem executado e o valor
+    produzido é None.
+    """
+    if not enabled:
+        yield None
+        return
+
+    with _session_lock:
+        with _profile_analysis() as report:
+            yield report
+
+
+@contextmanager
+def _profile_analysis() -> Iterator[ProfilingReport]:
+    """Executa uma sessão de profiling; chamada com `_session_lock` adquirido."""
+    import torch
+    from torch.profiler import ProfilerActivity, profile
+
+    run_id = f"{datetime.now().strftime('%Y%m%d-%H%M%S-%f')}-{uuid.uuid4().hex[:8]}"
+    output_dir = Path(PROFILING.OUTPUT_DIR) / run_id
+    output_dir.mkdir(parents=True, exist_ok=True)
+    report = ProfilingReport(output_dir=output_dir)
+
+    activities = [ProfilerActivity.CPU]
+    if torch.cuda.is_available():
+        activities.append(ProfilerActivity.CUDA)
+
+    entered: List[str] = []
+    sampler = PythonSampler((threading.get_ident(),))
+    with profile(activities=activities, record_shapes=True) as prof:
+        token = _entered_stages.set(entered)
+        sampler.start()
+        try:
+            yield report
+        finally:
+            sampler.stop()
+            _entered_stages.reset(token)
+
+    trace_path = output_dir / "trace.json"
+    prof.export_chrome_trace(str(trace_path))
+
+    stacks_path = output_dir / "python_stacks.collapsed"
+    sampler.write_collapsed(stacks_path)
+
+    stage_wall, per_stage = _aggregate_operators(prof.events())
+    report.warnings.extend(_check_operators(entered, per_stage))
+    summary_path = output_dir / "operators.txt"
+    summary_path.write_text(
+        _format_operators(stage_wall, per_stage, report.warnings), encoding="utf-8"
+    )
+
+    report.files.extend([trace_path, stacks_path, summary_path])
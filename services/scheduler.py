@@ -0,0 +1,411 @@
+"""Agendador de análise com orçamento de latência e degradação gradual."""
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from dataclasses import dataclass, field, replace
+import hashlib
+import math
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Sequence, Tuple, TypeVar
+
+from transformers import Pipeline
+
+from config.settings import LATENCY
+from .text_processor import analyze_text_emotion, TextResult
+from .image_processor import analyze_facial_emotion, ImageResult
+from .llm_combiner import analyze_with_local_llm, analyze_without_llm, CombinedAnalysis
+from .profiling import is_profiling
+
+T = TypeVar("T")
+
+# Etapas que estouram o prazo são abandonadas; os workers extras evitam que
+# uma etapa abandonada bloqueie as seguintes.
+_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="analysis")
+
+# Protege o cache, os custos observados e o registro de locks entre sessões.
+_state_lock = threading.Lock()
+
+# Pipelines e tokenizers da HF não são thread-safe: um lock por pipeline.
+_pipeline_locks: Dict[int, threading.Lock] = {}
+
+# Cache LRU: chave -> (resultado, veio de plano degradado)
+_result_cache: "OrderedDict[str, Tuple[object, bool]]" = OrderedDict()
+
+# Média móvel exponencial dos tempos observados por etapa/plano.
+_observed_costs: Dict[str, float] = {}
+
+_DEFAULT_COSTS = {
+    "text_full": LATENCY.TRANSLATION_FULL_COST_S + LATENCY.TEXT_CLASSIFICATION_COST_S,
+    "text_fast": LATENCY.TRANSLATION_FAST_COST_S + LATENCY.TEXT_CLASSIFICATION_COST_S,
+    "image_full": LATENCY.IMAGE_FULL_COST_S,
+    "gemini": LATENCY.GEMINI_COST_S,
+}
+
+
+class Deadline:
+    """Prazo absoluto de uma requisição, medido com relógio monotônico."""
+
+    def __init__(self, budget_s: float):
+        self._end = time.monotonic() + budget_s
+
+    def remaining(self) -> float:
+        """Segundos restantes até o prazo (nunca negativo)."""
+        return max(0.0, self._end - time.monotonic())
+
+    def allows(self, cost_s: float) -> bool:
+        """Indica se uma etapa com o custo estimado cabe no tempo restante."""
+        return cost_s <= self.remaining()
+
+    def limit(self, reserve_s: float = 0.0) -> Optional[float]:
+        """Tempo restante menos `reserve_s`, ou None se o prazo for ilimitado."""
+        remaining = self.remaining()
+        if math.isinf(remaining):
+            return None
+        return max(0.0, remaining - reserve_s)
+
+
+@dataclass
+class AnalysisOutcome:
+    """Resultado de uma análise agendada."""
+    text_result: Optional[TextResult]
+    image_result: Optional[ImageResult]
+    llm_analysis: Optional[CombinedAnalysis]
+    degraded_stages: List[str] = field(default_factory=list)
+
+
+def estimate_cost(plan: str) -> float:
+    """Retorna o custo estimado de um plano, preferindo o tempo observado."""
+    with _state_lock:
+        return _observed_costs.get(plan, _DEFAULT_COSTS[plan])
+
+
+def _record_cost(plan: str, elapsed: float) -> None:
+    """Atualiza a média móvel do tempo observado de um plano."""
+    with _state_lock:
+        previous = _observed_costs.get(plan)
+        if previous is None:
+            _observed_costs[plan] = elapsed
+        else:
+            alpha = LATENCY.COST_SMOOTHING
+            _observed_costs[plan] = alpha * elapsed + (1 - alpha) * previous
+
+
+def _cache_key(stage: str, payload: bytes, *options: object) -> str:
+    """Gera chave de cache a partir do conteúdo da entrada e das opções."""
+    digest = hashlib.sha256(payload).hexdigest()
+    return f"{stage}:{digest}:{':'.join(map(str, options))}"
+
+
+def _cache_get(key: str) -> Optional[Tuple[object, bool]]:
+    with _state_lock:
+        entry = _result_cache.get(key)
+        if entry is not None:
+            _result_cache.move_to_end(key)
+        return entry
+
+
+def _cache_put(key: str, result: object, degraded: bool) -> None:
+    with _state_lock:
+        cached = _result_cache.get(key)
+        # Nunca substitui um resultado completo por um degradado.
+        if cached is not None and not cached[1] and degraded:
+            return
+        _result_cache[key] = (result, degraded)
+        _result_cache.move_to_end(key)
+        while len(_result_cache) > LATENCY.RESULT_CACHE_SIZE:
+            _result_cache.popitem(last=False)
+
+
+def _lock_pipelines(
+    pipes: Sequence[Pipeline],
+    timeout: Optional[float]
+) -> Optional[List[threading.Lock]]:
+    """
+    Adquire os locks de todos os pipelines da etapa, aguardando até `timeout`.
+
+    Returns:
+        Os locks adquiridos, ou None se algum pipeline continuar em uso após
+        `timeout` segundos (None aguarda indefinidamente).
+    """
+    with _state_lock:
+        locks = [_pipeline_locks.setdefault(id(pipe), threading.Lock()) for pipe in pipes]
+    wait_until = None if timeout is None else time.monotonic() + timeout
+    acquired = []
+    for lock in locks:
+        wait = -1 if wait_until is None else max(0.0, wait_until - time.monotonic())
+        if not lock.acquire(timeout=wait):
+            _release(acquired)
+            return None
+        acquired.append(lock)
+    return acquired
+
+
+def _lock_for_plan(
+    plan: str,
+    pipes: Sequence[Pipeline],
+    deadline: Deadline
+) -> Optional[List[threading.Lock]]:
+    """
+    Aguarda os pipelines enquanto o plano ainda couber no prazo.
+
+    Durante o profiling (prazo ilimitado) aguarda indefinidamente.
+    """
+    return _lock_pipelines(pipes, deadline.limit(estimate_cost(plan)))
+
+
+def _release(locks: List[threading.Lock]) -> None:
+    for lock in locks:
+        lock.release()
+
+
+def _timed_call(
+    plan: str,
+    fn: Callable[[], T],
+    locks: List[threading.Lock],
+    complete: Callable[[T], bool]
+) -> T:
+    """Executa `fn` no worker, registrando o custo apenas de execuções concluídas."""
+    try:
+        started = time.monotonic()
+        result = fn()
+        if complete(result):
+            _record_cost(plan, time.monotonic() - started)
+        return result
+    finally:
+        _release(locks)
+
+
+def _run_with_deadline(
+    plan: str,
+    fn: Callable[[], T],
+    deadline: Deadline,
+    label: str,
+    degraded: List[str],
+    locks: List[threading.Lock],
+    complete: Callable[[T], bool] = lambda _: True
+) -> Optional[T]:
+    """
+    Executa `fn` limitada ao tempo restante do prazo.
+
+    `locks` são os locks dos pipelines da etapa, já adquiridos; eles só são
+    liberados quando `fn` termina, mesmo que ela seja abandonada. O custo do
+    plano só é registrado quando `complete(resultado)` é verdadeiro.
+    Durante o profiling a etapa roda na própria thread (o torch profiler só
+    registra a thread que o iniciou) e não atualiza os custos observados.
+
+    Returns:
+        O resultado de `fn`, ou None se `fn` falhar ou se o prazo expirar.
+        Nesses casos a degradação é registrada em `degraded` com o rótulo `label`.
+    """
+    if is_profiling():
+        try:
+            return fn()
+        except Exception as exc:
+            degraded.append(f"{label}: falhou ({type(exc).__name__})")
+            return None
+        finally:
+            _release(locks)
+
+    future = _executor.submit(_timed_call, plan, fn, locks, complete)
+    try:
+        return future.result(timeout=deadline.limit())
+    except FutureTimeoutError:
+        if future.cancel():
+            _release(locks)
+        degraded.append(f"{label}: cancelado por exceder o tempo limite")
+    except Exception as exc:
+        degraded.append(f"{label}: falhou ({type(exc).__name__})")
+    return None
+
+
+def _schedule_text(
+    translation_pipe: Pipeline,
+    text_emotion_pipe: Pipeline,
+    text: str,
+    deadline: Deadline,
+    degraded: List[str],
+    use_cache: bool
+) -> Optional[TextResult]:
+    """Escolhe e executa o plano de análise de texto."""
+    key = _cache_key("text", text.encode("utf-8"))
+    cached = _cache_get(key) if use_cache else None
+    if cached and not cached[1]:
+        return cached[0]
+
+    pipes = (translation_pipe, text_emotion_pipe)
+    busy = False
+    for plan, fast in (("text_full", False), ("text_fast", True)):
+        if not deadline.allows(estimate_cost(plan)):
+            continue
+        if fast and cached:
+            # Já existe um resultado do perfil rápido: evita reexecutá-lo.
+            break
+        locks = _lock_for_plan(plan, pipes, deadline)
+        if locks is None:
+            # Pipeline ocupado além do que o plano permite: tenta o mais barato.
+            busy = True
+            continue
+        # Reserva tempo para a classificação e interrompe a geração no limite.
+        max_time = deadline.limit(LATENCY.TEXT_CLASSIFICATION_COST_S)
+        if max_time is not None and max_time < LATENCY.MIN_TRANSLATION_TIME_S:
+            _release(locks)
+            break
+
+        result = _run_with_deadline(
+            plan,
+            lambda fast=fast, max_time=max_time: analyze_text_emotion(
+                translation_pipe, text_emotion_pipe, text, fast, max_time
+            ),
+            deadline,
+            "Texto",
+            degraded,
+            locks,
+            complete=lambda result: not result.truncated,
+        )
+        if result is None:
+            return None
+
+        if result.truncated:
+            # Tradução parcial: não entra no cache nem nos custos observados.
+            degraded.append("Texto: tradução interrompida no tempo limite (parcial)")
+            return result
+        if fast:
+            degraded.append("Texto: tradução com perfil rápido (sem beam search)")
+        _cache_put(key, result, fast)
+        return result
+
+    if cached:
+        degraded.append("Texto: resultado em cache do perfil rápido de tradução")
+        return cached[0]
+    if busy:
+        degraded.append("Texto: omitido, modelo ocupado por outra análise")
+    else:
+        degraded.append("Texto: omitido por falta de tempo")
+    return None
+
+
+def _schedule_image(
+    facial_emotion_pipe: Pipeline,
+    image_bytes: bytes,
+    filename: str,
+    use_grayscale: bool,
+    deadline: Deadline,
+    degraded: List[str],
+    use_cache: bool
+) -> Optional[ImageResult]:
+    """Executa a análise de imagem se couber no prazo, ou reutiliza o cache."""
+    key = _cache_key("image", image_bytes, use_grayscale)
+    cached = _cache_get(key) if use_cache else None
+    if cached:
+        # A chave ignora o nome do arquivo; usa o nome do upload atual.
+        return replace(cached[0], filename=filename)
+
+    if not deadline.allows(estimate_cost("image_full")):
+        degraded.append("Imagem: omitida por falta de tempo")
+        return None
+    locks = _lock_for_plan("image_full", (facial_emotion_pipe,), deadline)
+    if locks is None:
+        degraded.append("Imagem: omitida, modelo ocupado por outra análise")
+        return None
+
+    result = _run_with_deadline(
+        "image_full",
+        lambda: analyze_facial_emotion(
+            facial_emotion_pipe, image_bytes, filename, use_grayscale
+        ),
+        deadline,
+        "Imagem",
+        degraded,
+        locks,
+    )
+    if result is not None:
+        _cache_put(key, result, False)
+    return result
+
+
+def _schedule_combined(
+    text_result: Optional[TextResult],
+    image_result: Optional[ImageResult],
+    use_gemini: bool,
+    deadline: Deadline,
+    degraded: List[str]
+) -> CombinedAnalysis:
+    """Gera a análise combinada, recorrendo à lógica local se o Gemini não couber."""
+    if use_gemini and text_result and image_result:
+        if deadline.allows(estimate_cost("gemini")):
+            # A chamada HTTP expira antes do prazo para que o fallback ainda caiba.
+            timeout = deadline.limit(LATENCY.GEMINI_TIMEOUT_MARGIN_S)
+            if timeout is not None:
+                timeout = max(0.1, timeout)
+            analysis = _run_with_deadline(
+                "gemini",
+                lambda: analyze_with_local_llm(text_result, image_result, timeout),
+                deadline,
+                "Gemini (substituído pela análise local)",
+                degraded,
+                [],
+            )
+            if analysis is not None:
+                return analysis
+        else:
+            degraded.append("Gemini: substituído pela análise local por falta de tempo")
+
+    return analyze_without_llm(text_result, image_result)
+
+
+def run_scheduled_analysis(
+    translation_pipe: Pipeline,
+    text_emotion_pipe: Pipeline,
+    facial_emotion_pipe: Pipeline,
+    text: str,
+    image_bytes: Optional[bytes],
+    filename: str,
+    use_grayscale: bool,
+    use_gemini: bool,
+    budget_s: float = LATENCY.REQUEST_BUDGET_S,
+    use_cache: bool = True
+) -> AnalysisOutcome:
+    """
+    Executa a análise completa respeitando um prazo por requisição.
+
+    À medida que o orçamento diminui, cada etapa escolhe um plano mais barato
+    (resultado em cache, tradução gulosa, análise local no lugar do Gemini)
+    ou é omitida. Se um modelo estiver ocupado por outra análise, a etapa
+    aguarda enquanto o plano ainda couber no prazo antes de recorrer ao
+    plano mais barato ou ao cache. Etapas que não terminam a tempo ou falham
+    são descartadas e o resultado parcial é rotulado com as etapas degradadas.
+    Com `use_cache` falso os modelos sempre são executados e `budget_s` pode
+    ser `float("inf")` para um prazo ilimitado (ambos usados no profiling).
+
+    Returns:
+        AnalysisOutcome com os resultados disponíveis e as degradações aplicadas.
+    """
+    deadline = Deadline(budget_s)
+    degraded: List[str] = []
+
+    text_result = None
+    if text:
+        text_result = _schedule_text(
+            translation_pipe, text_emotion_pipe, text, deadline, degraded, use_cache
+        )
+
+    image_result = None
+    if image_bytes is not None:
+        image_result = _schedule_image(
+            facial_emotion_pipe, image_bytes, filename, use_grayscale, deadline, degraded,
+            use_cache
+        )
+
+    llm_analysis = None
+    # Com texto E imagem solicitados, devolve análise combinada mesmo que parcial.
+    if text and image_bytes is not None:
+        llm_analysis = _schedule_combined(
+            text_result, image_result, use_gemini, deadline, degraded
+        )
+
+    return AnalysisOutcome(
+        text_result=text_result,
+        image_result=image_result,
+        llm_analysis=llm_analysis,
+        degraded_stages=degraded,
+    )
@@ -1,9 +1,11 @@
 """Serviço de processamento de texto."""
 from dataclasses import dataclass
+import time
 from typing import Optional
 from transformers import Pipeline
 
 from config.settings import MODELS
+from .profiling import profile_stage
 
 
 @dataclass
@@ -13,35 +15,57 @@ class TextResult:
     translated: str
     emotion: str
     confidence: float
+    truncated: bool = False
 
 
-def translate_text(pipe: Pipeline, text: str) -> str:
-    """Traduz texto de Português para Inglês."""
-    output = pipe(
-        text, 
-        max_length=MODELS.MAX_TRANSLATION_LENGTH,
-        no_repeat_ngram_size=3,
-        repetition_penalty=2.0,
-        num_beams=4,
-        early_stopping=True
-    )
+def translate_text(
+    pipe: Pipeline,
+    text: str,
+    fast: bool = False,
+    max_time: Optional[float] = None
+) -> str:
+    """
+    Traduz texto de Português para Inglês.
+    
+    No perfil rápido (`fast`) usa decodificação gulosa em vez de beam search.
+    `max_time` (segundos) interrompe a geração ao atingir o limite.
+    """
+    with profile_stage("tradução"):
+        output = pipe(
+            text, 
+            max_length=MODELS.MAX_TRANSLATION_LENGTH,
+            no_repeat_ngram_size=3,
+            repetition_penalty=2.0,
+            num_beams=1 if fast else 4,
+            early_stopping=not fast,
+            max_time=max_time
+        )
     return output[0]['translation_text']
 
 
 def analyze_text_emotion(
     translation_pipe: Pipeline,
     emotion_pipe: Pipeline,
-    text: str
+    text: str,
+    fast: bool = False,
+    max_time: Optional[float] = None
 ) -> TextResult:
     """
     Processa texto completo: tradução e classificação de emoção.
+    
+    Se a tradução consumir todo o `max_time`, a geração foi interrompida e o
+    resultado é marcado como `truncated`.
     """
-    translated = translate_text(translation_pipe, text)
-    result = emotion_pipe(translated)[0][0]
+    started = time.monotonic()
+    translated = translate_text(translation_pipe, text, fast, max_time)
+    truncated = max_time is not None and time.monotonic() - started >= max_time
+    with profile_stage("classificação de texto"):
+        result = emotion_pipe(translated)[0][0]
     
     return TextResult(
         original=text,
         translated=translated,
         emotion=result['label'],
-        confidence=result['score'] * 100
+        confidence=result['score'] * 100,
+        truncated=truncated
     )
\ No newline at end of file